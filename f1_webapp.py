@@ -1,9 +1,312 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import fastf1
+import io
 import os
+import threading
 import numpy as np
 
+# Sidebar options, tuples of literals are constants of the compiled script so
+# nothing is rebuilt on each rerun
+YEARS = (2025, 2024, 2023, 2022, 2021, 2020, 2019, 2018)
+
+RACES = (
+    'Bahrain', 'Saudi Arabia', 'Australia', 'Japan', 'China',
+    'Miami', 'Monaco', 'Spain', 'Canada', 'Austria',
+    'Silverstone', 'Hungary', 'Belgium', 'Netherlands', 'Monza',
+    'Singapore', 'Austin', 'Mexico', 'Brazil', 'Las Vegas', 'Abu Dhabi'
+)
+
+SESSIONS = ('R', 'Q', 'FP1', 'FP2', 'FP3')
+SESSION_NAMES = {'R': 'Race', 'Q': 'Qualifying', 'FP1': 'Practice 1',
+                 'FP2': 'Practice 2', 'FP3': 'Practice 3'}
+
+# On-disk FastF1 cache, F1_CACHE_DIR can point at a mounted volume so it survives redeploys
+CACHE_DIR = os.environ.get('F1_CACHE_DIR', 'f1_cache')
+
+# Races downloaded into the cache in the background when the app starts with an
+# empty cache, starting with the default sidebar selection
+PRELOAD = [(YEARS[0], RACES[0]), (2024, 'Bahrain'), (2024, 'Monaco'), (2024, 'Silverstone'), (2024, 'Monza')]
+
+
+def preload_sessions(cache_ready):
+    # fastf1 (and everything it pulls in) is imported here, off the script thread,
+    # so the landing page renders without waiting for it
+    try:
+        import fastf1
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Parsing the sessions competes with the first user's own load, so only
+        # do it to fill an empty cache (e.g. a fresh volume), not on every start
+        cache_warm = bool(os.listdir(CACHE_DIR))
+        fastf1.Cache.enable_cache(CACHE_DIR)
+    finally:
+        cache_ready.set()
+
+    if cache_warm:
+        return
+
+    for year, race in PRELOAD:
+        try:
+            session = fastf1.get_session(year, race, 'R')
+            session.load(laps=True, telemetry=True, weather=False, messages=False)
+        except Exception:
+            # Best effort only, the session is loaded on demand instead
+            pass
+
+
+@st.cache_resource
+def start_preload():
+    # Cached so the thread is started once per server process, not on every rerun
+    cache_ready = threading.Event()
+    threading.Thread(target=preload_sessions, args=(cache_ready,), daemon=True).start()
+    return cache_ready
+
+
+def get_fastf1():
+    # Wait until the background thread has imported fastf1 and enabled the cache
+    start_preload().wait()
+    import fastf1
+    return fastf1
+
+
+start_preload()
+
+# Telemetry channels used by the dashboard, everything else is dropped after loading
+TELEMETRY_COLUMNS = ['Time', 'Distance', 'Speed', 'RPM', 'Throttle', 'Brake', 'nGear', 'DRS', 'X', 'Y']
+
+# Numeric channels stored as float32, plenty of precision for display and half the bytes
+FLOAT32_COLUMNS = ['Distance', 'Speed', 'RPM', 'Throttle', 'Brake', 'nGear', 'X', 'Y']
+
+
+def telemetry_frame(lap):
+    # FastF1 telemetry keeps a reference to the whole session, so convert it to a
+    # plain DataFrame with only the channels we need (DRS is not always available)
+    import pandas as pd
+
+    telemetry = lap.get_telemetry()
+    columns = [col for col in TELEMETRY_COLUMNS if col in telemetry.columns]
+    telemetry = pd.DataFrame(telemetry[columns]).reset_index(drop=True)
+    telemetry[FLOAT32_COLUMNS] = telemetry[FLOAT32_COLUMNS].astype(np.float32)
+    return telemetry
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 3600)
+def load_fastest(year, race, session_type):
+    # Loading a session is the slow part (download + parse), so cache the
+    # results per (year, race, session) and only keep plain, picklable data.
+    # Lap and sector times are stored as float seconds (NaN when missing)
+    # and the plot downsampling indices are computed here once per lap, not
+    # on every rerun
+    fastf1 = get_fastf1()
+    session = fastf1.get_session(year, race, session_type)
+    session.load(laps=True, telemetry=True, weather=False, messages=False)
+
+    fastest_lap = session.laps.pick_fastest()
+    telemetry = telemetry_frame(fastest_lap)
+    data = {
+        'driver': fastest_lap['Driver'],
+        'lap_time': fastest_lap['LapTime'].total_seconds(),
+        'sectors': (fastest_lap['Sector1Time'].total_seconds(),
+                    fastest_lap['Sector2Time'].total_seconds(),
+                    fastest_lap['Sector3Time'].total_seconds()),
+        'telemetry': telemetry,
+        'plot_idx': plot_indices(telemetry),
+    }
+
+    # Two fastest laps for the comparison section
+    try:
+        sorted_laps = session.laps.dropna(subset=['LapTime']).nsmallest(2, 'LapTime')
+        comparison = []
+        if len(sorted_laps) >= 2:
+            for i in range(2):
+                lap = sorted_laps.iloc[i]
+                lap_telemetry = telemetry_frame(lap)
+                comparison.append({
+                    'driver': lap['Driver'],
+                    'lap_time': lap['LapTime'].total_seconds(),
+                    'telemetry': lap_telemetry,
+                    'plot_idx': plot_indices(lap_telemetry),
+                })
+        data['comparison'] = comparison
+    except Exception:
+        data['comparison'] = None
+
+    return data
+
+
+# Number of points kept when downsampling telemetry for plotting
+PLOT_POINTS = 1500
+
+# Resolution used to render the track map and the wide comparison figures to PNG
+FIG_DPI = 80
+
+# Speed conversion factor from km/h to m/s
+KMH_TO_MS = 1 / 3.6
+
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets downsampling: returns the indices of the
+    # n_out points that best preserve the visual shape of y over x
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept, the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average point of the next bucket (the last point for the final bucket)
+        if i < n_out - 3:
+            next_end = edges[i + 2]
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # Keep the point forming the largest triangle with the previous pick
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev])
+                      - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(area.argmax())
+        idx[i + 1] = prev
+
+    return idx
+
+
+def plot_indices(telemetry):
+    # LTTB picks the points from the speed trace, so the samples on both sides
+    # of every Brake/DRS change are added back to keep on/off edges in place
+    idx = lttb_indices(telemetry['Distance'], telemetry['Speed'], PLOT_POINTS)
+    for col in ('Brake', 'DRS'):
+        if col in telemetry.columns:
+            changes = np.flatnonzero(np.diff(telemetry[col].to_numpy()) != 0)
+            idx = np.union1d(idx, np.concatenate([changes, changes + 1]))
+    return idx
+
+
+def track_segments(x, y):
+    # Turn an ordered X/Y path into (N-1, 2, 2) line segments for a LineCollection
+    points = np.column_stack([x, y]).reshape(-1, 1, 2)
+    return np.concatenate([points[:-1], points[1:]], axis=1)
+
+
+def compute_accel(speed_kmh, time):
+    # Acceleration in m/s² between consecutive telemetry samples, computed on plain
+    # numpy arrays (speed converted from km/h to m/s, time deltas in seconds) so the
+    # same kernel can be reused for any lap. Returns only the finite values, with
+    # data glitches clipped away
+    accel = np.diff(np.asarray(speed_kmh, dtype=np.float64))
+    accel *= KMH_TO_MS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accel /= np.diff(np.asarray(time)) / np.timedelta64(1, 's')
+
+    # Clean up any infinite or NaN values from division issues
+    accel = accel[np.isfinite(accel)]
+
+    # CRITICAL FIX: Remove extreme outliers using percentile method
+    # These are data glitches, not real accelerations
+    if len(accel) > 10:  # Only if we have enough data points
+        # Clip to the 1st/99th percentiles, with hard limits for physical reality
+        p01_accel, p99_accel = np.percentile(accel, [1, 99])
+        max_realistic_accel = min(p99_accel, 30)  # 3G max acceleration
+        min_realistic_accel = max(p01_accel, -70)  # 7G max braking
+        np.clip(accel, min_realistic_accel, max_realistic_accel, out=accel)
+
+    return accel
+
+
+def speed_stats(speed):
+    # Min, max and mean of a speed trace as plain reductions on the float32 array
+    # (the mean accumulates in float64). NaN samples are skipped like pandas does,
+    # with the mask only built when there are any
+    nan_mask = np.isnan(speed)
+    if nan_mask.any():
+        speed = speed[~nan_mask]
+        if speed.size == 0:
+            return np.nan, np.nan, np.nan
+    return speed.min(), speed.max(), speed.mean(dtype=np.float64)
+
+
+def colormap_rgba(values, cmap):
+    # Map values to RGBA once so the artist doesn't re-apply the norm + colormap on
+    # every draw; the returned ScalarMappable is only used to draw the colorbar
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.colors import Normalize
+
+    values = np.asarray(values, dtype=np.float64)
+    mappable = ScalarMappable(norm=Normalize(vmin=np.nanmin(values), vmax=np.nanmax(values)), cmap=cmap)
+    return mappable.to_rgba(values), mappable
+
+
+def plot_lines(ax, lines, colors, labels, linewidth=2):
+    # Draw several (x, y) traces on one axis as a single LineCollection, with proxy
+    # legend handles since a collection only carries one label
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
+    ax.add_collection(LineCollection([np.column_stack(line) for line in lines],
+                                     colors=colors, linewidths=linewidth))
+    ax.autoscale_view()
+    ax.legend(handles=[Line2D([], [], color=color, linewidth=linewidth, label=label)
+                       for color, label in zip(colors, labels)])
+
+
+def format_lap_time(lap_time):
+    # m:ss.fff from the lap time in seconds, no Timedelta string building or parsing
+    if np.isnan(lap_time):
+        return "N/A"
+    minutes, ms = divmod(round(lap_time * 1000), 60_000)
+    return f"{minutes}:{ms // 1000:02d}.{ms % 1000:03d}"
+
+
+def figure_png(fig, bbox_inches=None):
+    # st.pyplot always renders at 200 DPI with bbox_inches='tight' (an extra layout
+    # pass and draw), so save the PNG ourselves at the figure's own DPI instead
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=fig.dpi, bbox_inches=bbox_inches, pad_inches=0.1)
+    return buf.getvalue()
+
+
+def show_figure(fig):
+    # Figures are closed once shown, otherwise pyplot keeps every one of them alive
+    import matplotlib.pyplot as plt
+
+    st.image(figure_png(fig), width='stretch')
+    plt.close(fig)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def track_map_png(driver, race, year, x, y, speed):
+    # The map only depends on the lap, so cache the rendered PNG rather than the
+    # Figure itself (Figures are not safe to share between sessions)
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    fig_map, ax_map = plt.subplots(figsize=(10, 8), dpi=FIG_DPI)
+    # Draw the lap as one line collection colored by speed instead of thousands of markers
+    segments = track_segments(x, y)
+    speed_colors, speed_scale = colormap_rgba(speed[:-1], 'coolwarm')
+    ax_map.add_collection(LineCollection(segments, colors=speed_colors, linewidth=4))
+    ax_map.autoscale()
+    cbar = plt.colorbar(speed_scale, ax=ax_map)
+    cbar.set_label('Speed (km/h)')
+    ax_map.set_xlabel('X Position (m)')
+    ax_map.set_ylabel('Y Position (m)')
+    ax_map.set_title(f'{driver} - {race} {year}')
+    ax_map.set_aspect('equal')
+    ax_map.grid(True, alpha=0.3)
+
+    # Cached per lap, so cropping the equal-aspect map tightly is worth the extra pass
+    png = figure_png(fig_map, bbox_inches='tight')
+    plt.close(fig_map)
+    return png
+
+
 # Custom CSS for better design
 st.markdown("""
 <style>
@@ -59,20 +362,11 @@ st.markdown("**A project by Matthew King**")
 # Sidebar controls
 st.sidebar.header("Race Selection")
 
-YEAR = st.sidebar.selectbox("Year", [2025, 2024, 2023, 2022, 2021, 2020, 2019, 2018])
+YEAR = st.sidebar.selectbox("Year", YEARS)
 
-RACE = st.sidebar.selectbox("Race", [
-    'Bahrain', 'Saudi Arabia', 'Australia', 'Japan', 'China',
-    'Miami', 'Monaco', 'Spain', 'Canada', 'Austria',
-    'Silverstone', 'Hungary', 'Belgium', 'Netherlands', 'Monza',
-    'Singapore', 'Austin', 'Mexico', 'Brazil', 'Las Vegas', 'Abu Dhabi'
-])
+RACE = st.sidebar.selectbox("Race", RACES)
 
-SESSION = st.sidebar.selectbox("Session Type", 
-    ['R', 'Q', 'FP1', 'FP2', 'FP3'],
-    format_func=lambda x: {'R': 'Race', 'Q': 'Qualifying', 'FP1': 'Practice 1', 
-                           'FP2': 'Practice 2', 'FP3': 'Practice 3'}[x]
-)
+SESSION = st.sidebar.selectbox("Session Type", SESSIONS, format_func=SESSION_NAMES.get)
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("**Data Availability:**")
@@ -81,388 +375,389 @@ st.sidebar.info("Most races from 2018-2024 are available. Some 2025 races may st
 if st.sidebar.button("Check Data Availability"):
     with st.spinner("Checking..."):
         try:
-            os.makedirs('f1_cache', exist_ok=True)
-            fastf1.Cache.enable_cache('f1_cache')
-            test_session = fastf1.get_session(YEAR, RACE, SESSION)
+            test_session = get_fastf1().get_session(YEAR, RACE, SESSION)
             st.sidebar.success(f"{RACE} {YEAR} {SESSION} data is available!")
         except Exception as e:
             st.sidebar.error(f"Data not available for this combination")
 
 analyze_button = st.sidebar.button("Analyze", type="primary")
 
+# Analyses are kept in session state per selection, so reruns triggered by other
+# widgets keep showing the results without going back through the loader
+analysis_key = f"analysis_{YEAR}_{RACE}_{SESSION}"
+
 if analyze_button:
     with st.spinner("Loading race data... this may take a minute"):
-        os.makedirs('f1_cache', exist_ok=True)
-        fastf1.Cache.enable_cache('f1_cache')
-        
         try:
-            session = fastf1.get_session(YEAR, RACE, SESSION)
-            session.load()
-            
-            fastest_lap = session.laps.pick_fastest()
-            driver = fastest_lap['Driver']
-            lap_time = fastest_lap['LapTime']
-            
-            telemetry = fastest_lap.get_telemetry()
-            
-            max_speed = telemetry['Speed'].max()
-            min_speed = telemetry['Speed'].min()
-            avg_speed = telemetry['Speed'].mean()
-            max_rpm = telemetry['RPM'].max()
-            
-            telemetry['Time_seconds'] = telemetry['Time'].dt.total_seconds()
-            
-            # FIXED: Convert speed from km/h to m/s for acceleration calculation
-            telemetry['Speed_ms'] = telemetry['Speed'] / 3.6
-            
-            # Calculate acceleration in m/s²
-            telemetry['Acceleration'] = telemetry['Speed_ms'].diff() / telemetry['Time_seconds'].diff()
-            
-            # Clean up any infinite or NaN values from division issues
-            telemetry['Acceleration'] = telemetry['Acceleration'].replace([np.inf, -np.inf], np.nan)
+            st.session_state[analysis_key] = load_fastest(YEAR, RACE, SESSION)
+        except Exception as e:
+            st.session_state.pop(analysis_key, None)
+            st.error(f"Error loading data: {str(e)}")
+            st.info("Try a different race or session. Some combinations may not have data available.")
+
+if analysis_key in st.session_state:
+    # Plotting libraries are only imported once there is something to plot
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import to_rgba
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Let Agg drop sub-pixel vertices and draw long telemetry paths in chunks
+    matplotlib.rcParams.update({'path.simplify': True,
+                                'path.simplify_threshold': 1.0,
+                                'agg.path.chunksize': 10000})
+
+    try:
+        data = st.session_state[analysis_key]
+        
+        driver = data['driver']
+        lap_time = data['lap_time']
+        
+        telemetry = data['telemetry']
+        # Hot columns pulled out as plain numpy arrays once and reused below
+        speed = telemetry['Speed'].to_numpy()
+        distance = telemetry['Distance'].to_numpy()
+        
+        # Scalar metrics from a few numpy reductions over contiguous buffers
+        min_speed, max_speed, avg_speed = speed_stats(speed)
+        max_rpm, max_throttle, max_brake_pressure = np.nanmax(
+            telemetry[['RPM', 'Throttle', 'Brake']].to_numpy(), axis=0)
+        
+        # Calculate acceleration in m/s², cleaned of glitches
+        valid_accel = compute_accel(speed, telemetry['Time'].to_numpy())
+
+        # Calculate G-forces from cleaned data
+        max_accel_g_raw = valid_accel.max() / 9.81 if len(valid_accel) > 0 else 0
+        max_decel_g_raw = abs(valid_accel.min()) / 9.81 if len(valid_accel) > 0 else 0
+        
+        # Cap displayed values at realistic maximums (data can have spikes/glitches)
+        max_accel_g = min(max_accel_g_raw, 3.0)  # F1 realistically maxes at ~2.5-3G acceleration
+        max_decel_g = min(max_decel_g_raw, 7.0)  # F1 realistically maxes at ~6-7G braking
+        
+        # Downsampled copy used only for plotting, stats above use the full telemetry
+        plot_idx = data['plot_idx']
+        telemetry_plot = telemetry.iloc[plot_idx]
+        x_plot = telemetry_plot['X'].to_numpy()
+        y_plot = telemetry_plot['Y'].to_numpy()
+        speed_plot = speed[plot_idx]
+        
+        st.success("Data loaded successfully!")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Driver", driver)
+        with col2:
+            st.metric("Fastest Lap", format_lap_time(lap_time))
+        with col3:
+            st.metric("Max Speed", f"{max_speed:.1f} km/h")
+        
+        st.markdown("---")
+        col_left, col_right = st.columns([1.5, 1])
+        
+        with col_left:
+            st.subheader("Track Map")
+            map_png = track_map_png(driver, RACE, YEAR, x_plot, y_plot, speed_plot)
+            st.image(map_png, width='stretch')
+        
+        with col_right:
+            st.subheader("Performance Metrics")
+            st.markdown(f"**Max Speed:** {max_speed:.1f} km/h")
+            st.markdown(f"**Min Speed:** {min_speed:.1f} km/h")
+            st.markdown(f"**Avg Speed:** {avg_speed:.1f} km/h")
+            st.markdown(f"**Max RPM:** {max_rpm:.0f} RPM")
+            st.markdown(f"**Max Accel:** {max_accel_g:.2f} G")
+            st.markdown(f"**Max Braking:** {max_decel_g:.2f} G")
+            st.markdown(f"**Max Brake %:** {max_brake_pressure:.1f}%")
+            st.caption("Note: Brake data is often incomplete in F1 telemetry")
+            st.markdown(f"**Max Throttle:** {max_throttle:.1f}%")
+        
+        st.markdown("---")
+        st.subheader("Engineering Insights")
+
+        col_insight1, col_insight2 = st.columns(2)
+
+        with col_insight1:
+            st.markdown("#### **Braking Performance**")
+            st.markdown(f"""
+            - **Maximum deceleration:** {max_decel_g:.2f} G ({max_decel_g * 9.81:.1f} m/s²)
+            - For context: A road car typically achieves 0.8-1.0 G under emergency braking
+            """)
             
-            # CRITICAL FIX: Remove extreme outliers using percentile method
-            # These are data glitches, not real accelerations
-            valid_accel = telemetry['Acceleration'].dropna()
+            st.markdown("#### **Acceleration Analysis**")
+            st.markdown(f"""
+            - **Maximum acceleration:** {max_accel_g:.2f} G ({max_accel_g * 9.81:.1f} m/s²)
+            - This acceleration requires massive aerodynamic downforce and tire grip
+            - Driver experiences force equivalent to **{max_accel_g * 75:.0f} kg** on a 75kg body
+            - Peak acceleration occurs at mid-range speeds where downforce is optimized
+            """)
+
+        with col_insight2:
+            st.markdown("#### **Speed & Power**")
+            # Drag power 0.5 * rho * CdA * v³ (air density 1.2 kg/m³, CdA 1.0 m²), in kW
+            top_speed_ms = max_speed * KMH_TO_MS
+            estimated_power = 0.5 * 1.2 * 1.0 * top_speed_ms**3 / 1000
+            st.markdown(f"""
+            - **Top speed:** {max_speed:.1f} km/h ({max_speed/1.609:.1f} mph)
+            - **Estimated power at top speed:** ~{estimated_power:.0f} kW (~{estimated_power * 1.34:.0f} HP)
+            - At this speed, aerodynamic drag is the dominant resistance force
+            - Fuel consumption at max speed: ~75-100 kg/hour
+            """)
             
-            if len(valid_accel) > 10:  # Only if we have enough data points
-                # Cap at 99th percentile to remove spikes
-                p99_accel = valid_accel.quantile(0.99)
-                p01_accel = valid_accel.quantile(0.01)
+            st.markdown("#### **Corner Loading**")
+            corner_speed = (min_speed + max_speed) / 2
+            st.markdown(f"""
+            - **Speed range:** {min_speed:.1f} to {max_speed:.1f} km/h
+            - **Minimum corner speed:** {min_speed:.1f} km/h
+            - Modern F1 cars generate **3-6 G laterally** in high-speed corners
+            - Tire contact patch: ~15cm × 20cm per tire under load
+            - Driver neck muscles experience forces equivalent to supporting **{4 * 5:.0f}+ kg** in sustained corners
+            """)
+        
+        # Sector Times and DRS Analysis
+        st.markdown("---")
+        col_sector, col_drs = st.columns(2)
+
+        with col_sector:
+            st.subheader("Sector Times Breakdown")
+            st.caption("F1 tracks are divided into 3 sectors. This shows how much time the driver spent in each section of the track.")
+            try:
+                s1_sec, s2_sec, s3_sec = data['sectors']
                 
-                # Also apply hard limits for physical reality
-                max_realistic_accel = min(p99_accel, 30)  # 3G max acceleration
-                min_realistic_accel = max(p01_accel, -70)  # 7G max braking
+                total_time = s1_sec + s2_sec + s3_sec
                 
-                telemetry['Acceleration'] = telemetry['Acceleration'].clip(
-                    lower=min_realistic_accel, 
-                    upper=max_realistic_accel
-                )
-            
-            # Calculate G-forces from cleaned data
-            valid_accel = telemetry['Acceleration'].dropna()
-            max_accel_g_raw = valid_accel.max() / 9.81 if len(valid_accel) > 0 else 0
-            max_decel_g_raw = abs(valid_accel.min()) / 9.81 if len(valid_accel) > 0 else 0
-            
-            # Cap displayed values at realistic maximums (data can have spikes/glitches)
-            max_accel_g = min(max_accel_g_raw, 3.0)  # F1 realistically maxes at ~2.5-3G acceleration
-            max_decel_g = min(max_decel_g_raw, 7.0)  # F1 realistically maxes at ~6-7G braking
-            
-            max_brake_pressure = telemetry['Brake'].max()
-            max_throttle = telemetry['Throttle'].max()
-            
-            st.success("Data loaded successfully!")
-            
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Driver", driver)
-            with col2:
-                st.metric("Fastest Lap", str(lap_time).split()[-1])
-            with col3:
-                st.metric("Max Speed", f"{max_speed:.1f} km/h")
-            
-            st.markdown("---")
-            col_left, col_right = st.columns([1.5, 1])
-            
-            with col_left:
-                st.subheader("Track Map")
-                fig_map, ax_map = plt.subplots(figsize=(10, 8))
-                points = ax_map.scatter(telemetry['X'], telemetry['Y'], 
-                                      c=telemetry['Speed'], 
-                                      cmap='coolwarm', s=20)
-                cbar = plt.colorbar(points, ax=ax_map)
-                cbar.set_label('Speed (km/h)')
-                ax_map.set_xlabel('X Position (m)')
-                ax_map.set_ylabel('Y Position (m)')
-                ax_map.set_title(f'{driver} - {RACE} {YEAR}')
-                ax_map.set_aspect('equal')
-                ax_map.grid(True, alpha=0.3)
-                st.pyplot(fig_map)
-            
-            with col_right:
-                st.subheader("Performance Metrics")
-                st.markdown(f"**Max Speed:** {max_speed:.1f} km/h")
-                st.markdown(f"**Min Speed:** {min_speed:.1f} km/h")
-                st.markdown(f"**Avg Speed:** {avg_speed:.1f} km/h")
-                st.markdown(f"**Max RPM:** {max_rpm:.0f} RPM")
-                st.markdown(f"**Max Accel:** {max_accel_g:.2f} G")
-                st.markdown(f"**Max Braking:** {max_decel_g:.2f} G")
-                st.markdown(f"**Max Brake %:** {max_brake_pressure:.1f}%")
-                st.caption("Note: Brake data is often incomplete in F1 telemetry")
-                st.markdown(f"**Max Throttle:** {max_throttle:.1f}%")
-            
-            st.markdown("---")
-            st.subheader("Engineering Insights")
-
-            col_insight1, col_insight2 = st.columns(2)
-
-            with col_insight1:
-                st.markdown("#### **Braking Performance**")
                 st.markdown(f"""
-                - **Maximum deceleration:** {max_decel_g:.2f} G ({max_decel_g * 9.81:.1f} m/s²)
-                - For context: A road car typically achieves 0.8-1.0 G under emergency braking
-                """)
+                **Sector 1:** {s1_sec:.3f}s ({s1_sec/total_time*100:.1f}% of lap)  
+                **Sector 2:** {s2_sec:.3f}s ({s2_sec/total_time*100:.1f}% of lap)  
+                **Sector 3:** {s3_sec:.3f}s ({s3_sec/total_time*100:.1f}% of lap)
                 
-                st.markdown("#### **Acceleration Analysis**")
-                st.markdown(f"""
-                - **Maximum acceleration:** {max_accel_g:.2f} G ({max_accel_g * 9.81:.1f} m/s²)
-                - This acceleration requires massive aerodynamic downforce and tire grip
-                - Driver experiences force equivalent to **{max_accel_g * 75:.0f} kg** on a 75kg body
-                - Peak acceleration occurs at mid-range speeds where downforce is optimized
+                **Total Lap Time:** {total_time:.3f}s
                 """)
+                
+            except Exception as e:
+                st.info("Sector time data not available for this session")
 
-            with col_insight2:
-                st.markdown("#### **Speed & Power**")
-                drag_force = 0.5 * 1.2 * 1.0 * (max_speed/3.6)**2
-                estimated_power = drag_force * (max_speed/3.6) / 1000
-                st.markdown(f"""
-                - **Top speed:** {max_speed:.1f} km/h ({max_speed/1.609:.1f} mph)
-                - **Estimated power at top speed:** ~{estimated_power:.0f} kW (~{estimated_power * 1.34:.0f} HP)
-                - At this speed, aerodynamic drag is the dominant resistance force
-                - Fuel consumption at max speed: ~75-100 kg/hour
-                """)
+        with col_drs:
+            st.subheader("DRS Usage Analysis")
+            if 'DRS' in telemetry.columns:
+                # One boolean mask and masked sums on the raw arrays, no filtered DataFrame copies
+                drs_active = telemetry['DRS'].to_numpy() > 0
+                n_drs = int(drs_active.sum())
+                drs_percentage = n_drs / len(drs_active) * 100
                 
-                st.markdown("#### **Corner Loading**")
-                corner_speed = (min_speed + max_speed) / 2
-                st.markdown(f"""
-                - **Speed range:** {min_speed:.1f} to {max_speed:.1f} km/h
-                - **Minimum corner speed:** {min_speed:.1f} km/h
-                - Modern F1 cars generate **3-6 G laterally** in high-speed corners
-                - Tire contact patch: ~15cm × 20cm per tire under load
-                - Driver neck muscles experience forces equivalent to supporting **{4 * 5:.0f}+ kg** in sustained corners
-                """)
-            
-            # Sector Times and DRS Analysis
-            st.markdown("---")
-            col_sector, col_drs = st.columns(2)
-
-            with col_sector:
-                st.subheader("Sector Times Breakdown")
-                st.caption("F1 tracks are divided into 3 sectors. This shows how much time the driver spent in each section of the track.")
-                try:
-                    sector1 = fastest_lap['Sector1Time']
-                    sector2 = fastest_lap['Sector2Time']
-                    sector3 = fastest_lap['Sector3Time']
-                    
-                    s1_sec = sector1.total_seconds() if hasattr(sector1, 'total_seconds') else sector1
-                    s2_sec = sector2.total_seconds() if hasattr(sector2, 'total_seconds') else sector2
-                    s3_sec = sector3.total_seconds() if hasattr(sector3, 'total_seconds') else sector3
-                    
-                    total_time = s1_sec + s2_sec + s3_sec
+                # CHECK IF DRS WAS ACTUALLY USED
+                if n_drs > 0 and drs_percentage < 95:  # Sanity check: DRS shouldn't be >95% of lap
+                    # Missing speed samples are left out of both averages, like pandas' mean()
+                    valid_speed = np.isfinite(speed)
+                    with_drs = drs_active & valid_speed
+                    without_drs = ~drs_active & valid_speed
+                    avg_speed_with_drs = speed.sum(where=with_drs, dtype=np.float64) / with_drs.sum()
+                    avg_speed_without_drs = speed.sum(where=without_drs, dtype=np.float64) / without_drs.sum()
+                    speed_gain = avg_speed_with_drs - avg_speed_without_drs
                     
                     st.markdown(f"""
-                    **Sector 1:** {s1_sec:.3f}s ({s1_sec/total_time*100:.1f}% of lap)  
-                    **Sector 2:** {s2_sec:.3f}s ({s2_sec/total_time*100:.1f}% of lap)  
-                    **Sector 3:** {s3_sec:.3f}s ({s3_sec/total_time*100:.1f}% of lap)
+                    **DRS Active:** {drs_percentage:.1f}% of lap distance  
+                    **Average speed with DRS:** {avg_speed_with_drs:.1f} km/h  
+                    **Average speed without DRS:** {avg_speed_without_drs:.1f} km/h  
+                    **Estimated speed gain:** {speed_gain:.1f} km/h
                     
-                    **Total Lap Time:** {total_time:.3f}s
+                    *DRS (Drag Reduction System) opens the rear wing to reduce drag on designated straights*
                     """)
                     
-                except Exception as e:
-                    st.info("Sector time data not available for this session")
-
-            with col_drs:
-                st.subheader("DRS Usage Analysis")
-                if 'DRS' in telemetry.columns:
-                    drs_active = telemetry['DRS'] > 0
-                    drs_distance = telemetry[drs_active]['Distance'].count()
-                    total_distance = len(telemetry)
-                    drs_percentage = (drs_distance / total_distance) * 100
-                    
-                    # CHECK IF DRS WAS ACTUALLY USED
-                    if drs_distance > 0 and drs_percentage < 95:  # Sanity check: DRS shouldn't be >95% of lap
-                        avg_speed_with_drs = telemetry[drs_active]['Speed'].mean()
-                        avg_speed_without_drs = telemetry[~drs_active]['Speed'].mean()
-                        speed_gain = avg_speed_with_drs - avg_speed_without_drs
-                        
-                        st.markdown(f"""
-                        **DRS Active:** {drs_percentage:.1f}% of lap distance  
-                        **Average speed with DRS:** {avg_speed_with_drs:.1f} km/h  
-                        **Average speed without DRS:** {avg_speed_without_drs:.1f} km/h  
-                        **Estimated speed gain:** {speed_gain:.1f} km/h
-                        
-                        *DRS (Drag Reduction System) opens the rear wing to reduce drag on designated straights*
-                        """)
-                        
-                        # ONLY PLOT IF DRS WAS USED
-                        fig_drs, ax_drs = plt.subplots(figsize=(8, 4))
-                        scatter = ax_drs.scatter(telemetry['X'], telemetry['Y'], 
-                                                c=telemetry['DRS'], 
-                                                cmap='RdYlGn', 
-                                                s=15,
-                                                alpha=0.6)
-                        ax_drs.set_xlabel('X Position (m)')
-                        ax_drs.set_ylabel('Y Position (m)')
-                        ax_drs.set_title('DRS Zones (Green = Active)')
-                        ax_drs.set_aspect('equal')
-                        ax_drs.grid(True, alpha=0.3)
-                        plt.colorbar(scatter, ax=ax_drs, label='DRS Status')
-                        st.pyplot(fig_drs)
-                    else:
-                        # DRS column exists but no DRS was used
-                        st.info("DRS data available but not activated on this lap")
-                        st.caption("The fastest lap may have been set while running solo. DRS can only be activated when within 1 second of another car.")
+                    # ONLY PLOT IF DRS WAS USED
+                    fig_drs, ax_drs = plt.subplots(figsize=(8, 4))
+                    # Same single line collection approach as the track map, colored by DRS status
+                    drs_segments = track_segments(x_plot, y_plot)
+                    drs_colors, drs_scale = colormap_rgba(telemetry_plot['DRS'].to_numpy()[:-1], 'RdYlGn')
+                    ax_drs.add_collection(LineCollection(drs_segments, colors=drs_colors, linewidth=3, alpha=0.6))
+                    ax_drs.autoscale()
+                    ax_drs.set_xlabel('X Position (m)')
+                    ax_drs.set_ylabel('Y Position (m)')
+                    ax_drs.set_title('DRS Zones (Green = Active)')
+                    ax_drs.set_aspect('equal')
+                    ax_drs.grid(True, alpha=0.3)
+                    plt.colorbar(drs_scale, ax=ax_drs, label='DRS Status')
+                    show_figure(fig_drs)
                 else:
-                    st.info("DRS data not available for this session")
-                    st.caption("DRS telemetry is rarely available in the FastF1 data library. Most sessions will not have this data even for Race and Qualifying.")
-            
-            st.markdown("---")
-            st.subheader("Telemetry Analysis")
-            
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
-            
-            ax1.plot(telemetry['Distance'], telemetry['Speed'], color='red', linewidth=2)
-            ax1.set_ylabel('Speed (km/h)')
-            ax1.set_title(f'{driver} - Fastest Lap Telemetry')
-            ax1.grid(True, alpha=0.3)
-            
-            ax2.plot(telemetry['Distance'], telemetry['Throttle'], label='Throttle', color='green', linewidth=2)
-            ax2.plot(telemetry['Distance'], telemetry['Brake'], label='Brake', color='red', linewidth=2)
-            ax2.set_ylabel('Input (%)')
-            ax2.grid(True, alpha=0.3)
-            ax2.legend()
-            
-            ax3_gear = ax3.twinx()
-            ax3.plot(telemetry['Distance'], telemetry['RPM'], label='RPM', color='purple', linewidth=2)
-            ax3_gear.plot(telemetry['Distance'], telemetry['nGear'], label='Gear', color='orange', linewidth=2, linestyle='--')
-            ax3.set_xlabel('Distance (meters)')
-            ax3.set_ylabel('RPM', color='purple')
-            ax3_gear.set_ylabel('Gear', color='orange')
-            ax3.grid(True, alpha=0.3)
-            ax3.legend(loc='upper left')
-            ax3_gear.legend(loc='upper right')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-            
-            # Driver Comparison Section
-            st.markdown("---")
-            st.subheader("Lap Comparison: Fastest vs Second Fastest")
-            st.caption("Comparing the two fastest laps from this session. This shows where time was gained or lost.")
+                    # DRS column exists but no DRS was used
+                    st.info("DRS data available but not activated on this lap")
+                    st.caption("The fastest lap may have been set while running solo. DRS can only be activated when within 1 second of another car.")
+            else:
+                st.info("DRS data not available for this session")
+                st.caption("DRS telemetry is rarely available in the FastF1 data library. Most sessions will not have this data even for Race and Qualifying.")
+        
+        st.markdown("---")
+        st.subheader("Telemetry Analysis")
+        
+        # Plotly with WebGL traces so the browser draws the lines instead of the server
+        fig = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                            specs=[[{}], [{}], [{'secondary_y': True}]])
+        distance_plot = distance[plot_idx]
+        
+        fig.add_trace(go.Scattergl(x=distance_plot, y=speed_plot, mode='lines', name='Speed',
+                                   line=dict(color='red', width=2)), row=1, col=1)
+        
+        fig.add_trace(go.Scattergl(x=distance_plot, y=telemetry_plot['Throttle'].to_numpy(), mode='lines', name='Throttle',
+                                   line=dict(color='green', width=2)), row=2, col=1)
+        fig.add_trace(go.Scattergl(x=distance_plot, y=telemetry_plot['Brake'].to_numpy(), mode='lines', name='Brake',
+                                   line=dict(color='red', width=2)), row=2, col=1)
+        
+        fig.add_trace(go.Scattergl(x=distance_plot, y=telemetry_plot['RPM'].to_numpy(), mode='lines', name='RPM',
+                                   line=dict(color='purple', width=2)), row=3, col=1)
+        fig.add_trace(go.Scattergl(x=distance_plot, y=telemetry_plot['nGear'].to_numpy(), mode='lines', name='Gear',
+                                   line=dict(color='orange', width=2, dash='dash')),
+                      row=3, col=1, secondary_y=True)
+        
+        fig.update_yaxes(title_text='Speed (km/h)', row=1, col=1)
+        fig.update_yaxes(title_text='Input (%)', row=2, col=1)
+        fig.update_yaxes(title_text='RPM', title_font_color='purple', row=3, col=1)
+        fig.update_yaxes(title_text='Gear', title_font_color='orange', row=3, col=1, secondary_y=True)
+        fig.update_xaxes(title_text='Distance (meters)', row=3, col=1)
+        fig.update_layout(title_text=f'{driver} - Fastest Lap Telemetry', height=800)
+        
+        st.plotly_chart(fig)
+        
+        # Driver Comparison Section
+        st.markdown("---")
+        st.subheader("Lap Comparison: Fastest vs Second Fastest")
+        st.caption("Comparing the two fastest laps from this session. This shows where time was gained or lost.")
+        
+        try:
+            # Get the two fastest laps
+            comparison = data['comparison']
+            if comparison is None:
+                raise ValueError("Lap comparison data could not be loaded")
             
-            try:
-                # Get the two fastest laps
-                sorted_laps = session.laps.sort_values('LapTime').head(2)
+            if len(comparison) >= 2:
+                lap1, lap2 = comparison
                 
-                if len(sorted_laps) >= 2:
-                    lap1 = sorted_laps.iloc[0]
-                    lap2 = sorted_laps.iloc[1]
-                    
-                    driver1 = lap1['Driver']
-                    driver2 = lap2['Driver']
-                    time1 = lap1['LapTime']
-                    time2 = lap2['LapTime']
-                    
-                    time_diff = (time2 - time1).total_seconds()
-                    
-                    telemetry1 = lap1.get_telemetry()
-                    telemetry2 = lap2.get_telemetry()
-                    
-                    # Add time column
-                    telemetry1['Time_seconds'] = telemetry1['Time'].dt.total_seconds()
-                    telemetry2['Time_seconds'] = telemetry2['Time'].dt.total_seconds()
-                    
-                    # Display comparison header
-                    col_comp1, col_comp2, col_comp3 = st.columns(3)
-                    with col_comp1:
-                        st.metric("Fastest Lap", f"{driver1}", f"{str(time1).split()[-1]}")
-                    with col_comp2:
-                        st.metric("Second Fastest", f"{driver2}", f"{str(time2).split()[-1]}")
-                    with col_comp3:
-                        st.metric("Time Difference", f"+{time_diff:.3f}s")
-                    
-                    if driver1 == driver2:
-                        st.info(f"Both laps are from {driver1}. Comparing their fastest and second-fastest laps.")
-                    else:
-                        st.info(f"Comparing {driver1}'s fastest lap against {driver2}'s fastest lap.")
-                    
-                    # Speed Comparison
-                    st.markdown("#### Speed Comparison")
-                    fig_comp_speed, ax_comp_speed = plt.subplots(figsize=(14, 6))
-                    
-                    ax_comp_speed.plot(telemetry1['Distance'], telemetry1['Speed'], 
-                                      label=f'{driver1} (Fastest)', color='red', linewidth=2.5)
-                    ax_comp_speed.plot(telemetry2['Distance'], telemetry2['Speed'], 
-                                      label=f'{driver2} (2nd Fastest)', color='blue', linewidth=2.5, alpha=0.7)
-                    
-                    ax_comp_speed.set_xlabel('Distance (meters)')
-                    ax_comp_speed.set_ylabel('Speed (km/h)')
-                    ax_comp_speed.set_title('Speed Trace Comparison')
-                    ax_comp_speed.grid(True, alpha=0.3)
-                    ax_comp_speed.legend(loc='upper right')
-                    
-                    st.pyplot(fig_comp_speed)
-                    
-                    # Throttle and Brake Comparison
-                    st.markdown("#### Driver Input Comparison")
-                    fig_comp_input, (ax_throttle, ax_brake) = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
-                    
-                    # Throttle comparison
-                    ax_throttle.plot(telemetry1['Distance'], telemetry1['Throttle'], 
-                                    label=f'{driver1}', color='red', linewidth=2)
-                    ax_throttle.plot(telemetry2['Distance'], telemetry2['Throttle'], 
-                                    label=f'{driver2}', color='blue', linewidth=2, alpha=0.7)
-                    ax_throttle.set_ylabel('Throttle (%)')
-                    ax_throttle.set_title('Throttle Application Comparison')
-                    ax_throttle.grid(True, alpha=0.3)
-                    ax_throttle.legend()
-                    
-                    # Brake comparison
-                    ax_brake.plot(telemetry1['Distance'], telemetry1['Brake'], 
-                                 label=f'{driver1}', color='red', linewidth=2)
-                    ax_brake.plot(telemetry2['Distance'], telemetry2['Brake'], 
-                                 label=f'{driver2}', color='blue', linewidth=2, alpha=0.7)
-                    ax_brake.set_xlabel('Distance (meters)')
-                    ax_brake.set_ylabel('Brake (Binary: 0=Off, 1=On)')
-                    ax_brake.set_title('Brake Application Comparison')
-                    ax_brake.grid(True, alpha=0.3)
-                    ax_brake.legend()
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig_comp_input)
-                    st.caption("Note: FastF1 data library provides brake application as binary (0=off, 1=on) rather than percentage values.")
-                    
-                    # Statistical Comparison
-                    st.markdown("#### Performance Statistics Comparison")
-                    col_stats1, col_stats2 = st.columns(2)
-                    
-                    with col_stats1:
-                        st.markdown(f"**{driver1} (Fastest Lap)**")
-                        st.markdown(f"Max Speed: {telemetry1['Speed'].max():.1f} km/h")
-                        st.markdown(f"Avg Speed: {telemetry1['Speed'].mean():.1f} km/h")
-                        st.markdown(f"Min Speed: {telemetry1['Speed'].min():.1f} km/h")
-                        st.markdown(f"Max RPM: {telemetry1['RPM'].max():.0f}")
-                    
-                    with col_stats2:
-                        st.markdown(f"**{driver2} (Second Fastest)**")
-                        st.markdown(f"Max Speed: {telemetry2['Speed'].max():.1f} km/h")
-                        st.markdown(f"Avg Speed: {telemetry2['Speed'].mean():.1f} km/h")
-                        st.markdown(f"Min Speed: {telemetry2['Speed'].min():.1f} km/h")
-                        st.markdown(f"Max RPM: {telemetry2['RPM'].max():.0f}")
-                    
-                    # Delta analysis
-                    st.markdown("#### Key Differences")
-                    speed_delta = telemetry1['Speed'].max() - telemetry2['Speed'].max()
-                    avg_speed_delta = telemetry1['Speed'].mean() - telemetry2['Speed'].mean()
-                    
-                    st.markdown(f"""
-                    - **Top speed advantage:** {abs(speed_delta):.1f} km/h in favor of {driver1 if speed_delta > 0 else driver2}
-                    - **Average speed advantage:** {abs(avg_speed_delta):.1f} km/h in favor of {driver1 if avg_speed_delta > 0 else driver2}
-                    - **Total time difference:** {time_diff:.3f} seconds
-                    """)
-                    
+                driver1 = lap1['driver']
+                driver2 = lap2['driver']
+                time1 = lap1['lap_time']
+                time2 = lap2['lap_time']
+                
+                time_diff = time2 - time1
+                
+                telemetry1 = lap1['telemetry']
+                telemetry2 = lap2['telemetry']
+                
+                # Downsampled plain numpy arrays for plotting (so matplotlib doesn't convert
+                # each Series again), the statistics below use the full telemetry
+                plot1 = telemetry1.iloc[lap1['plot_idx']]
+                plot2 = telemetry2.iloc[lap2['plot_idx']]
+                dist1 = plot1['Distance'].to_numpy()
+                dist2 = plot2['Distance'].to_numpy()
+                speed1 = plot1['Speed'].to_numpy()
+                speed2 = plot2['Speed'].to_numpy()
+                throttle1 = plot1['Throttle'].to_numpy()
+                throttle2 = plot2['Throttle'].to_numpy()
+                brake1 = plot1['Brake'].to_numpy()
+                brake2 = plot2['Brake'].to_numpy()
+                
+                # Display comparison header
+                col_comp1, col_comp2, col_comp3 = st.columns(3)
+                with col_comp1:
+                    st.metric("Fastest Lap", f"{driver1}", format_lap_time(time1))
+                with col_comp2:
+                    st.metric("Second Fastest", f"{driver2}", format_lap_time(time2))
+                with col_comp3:
+                    st.metric("Time Difference", f"+{time_diff:.3f}s")
+                
+                if driver1 == driver2:
+                    st.info(f"Both laps are from {driver1}. Comparing their fastest and second-fastest laps.")
                 else:
-                    st.info("Not enough laps available for comparison. Need at least 2 valid laps in this session.")
-                    
-            except Exception as e:
-                st.warning("Lap comparison data not available for this session")
-                st.caption("This feature requires at least 2 valid laps with telemetry data")
-            
+                    st.info(f"Comparing {driver1}'s fastest lap against {driver2}'s fastest lap.")
+                
+                # Speed Comparison
+                st.markdown("#### Speed Comparison")
+                fig_comp_speed, ax_comp_speed = plt.subplots(figsize=(14, 6), dpi=FIG_DPI)
+                
+                ax_comp_speed.plot(dist1, speed1, 
+                                  label=f'{driver1} (Fastest)', color='red', linewidth=2.5)
+                ax_comp_speed.plot(dist2, speed2, 
+                                  label=f'{driver2} (2nd Fastest)', color='blue', linewidth=2.5, alpha=0.7)
+                
+                ax_comp_speed.set_xlabel('Distance (meters)')
+                ax_comp_speed.set_ylabel('Speed (km/h)')
+                ax_comp_speed.set_title('Speed Trace Comparison')
+                ax_comp_speed.grid(True, alpha=0.3)
+                ax_comp_speed.legend(loc='upper right')
+                fig_comp_speed.subplots_adjust(left=0.05, right=0.99, top=0.93, bottom=0.1)
+                
+                show_figure(fig_comp_speed)
+                
+                # Throttle and Brake Comparison
+                st.markdown("#### Driver Input Comparison")
+                fig_comp_input, (ax_throttle, ax_brake) = plt.subplots(2, 1, figsize=(14, 8), dpi=FIG_DPI, sharex=True)
+                
+                # Both drivers go into one line collection per axis
+                comp_colors = ['red', to_rgba('blue', 0.7)]
+                comp_labels = [f'{driver1}', f'{driver2}']
+                
+                # Throttle comparison
+                plot_lines(ax_throttle, [(dist1, throttle1), (dist2, throttle2)], comp_colors, comp_labels)
+                ax_throttle.set_ylabel('Throttle (%)')
+                ax_throttle.set_title('Throttle Application Comparison')
+                ax_throttle.grid(True, alpha=0.3)
+                
+                # Brake comparison
+                plot_lines(ax_brake, [(dist1, brake1), (dist2, brake2)], comp_colors, comp_labels)
+                ax_brake.set_xlabel('Distance (meters)')
+                ax_brake.set_ylabel('Brake (Binary: 0=Off, 1=On)')
+                ax_brake.set_title('Brake Application Comparison')
+                ax_brake.grid(True, alpha=0.3)
+                
+                # Fixed margins (what tight_layout settles on) so no layout solver runs per click
+                fig_comp_input.subplots_adjust(left=0.05, right=0.99, top=0.95, bottom=0.07, hspace=0.14)
+                show_figure(fig_comp_input)
+                st.caption("Note: FastF1 data library provides brake application as binary (0=off, 1=on) rather than percentage values.")
+                
+                # Statistical Comparison
+                min_speed1, max_speed1, avg_speed1 = speed_stats(telemetry1['Speed'].to_numpy())
+                min_speed2, max_speed2, avg_speed2 = speed_stats(telemetry2['Speed'].to_numpy())
+                max_rpm1 = np.nanmax(telemetry1['RPM'].to_numpy())
+                max_rpm2 = np.nanmax(telemetry2['RPM'].to_numpy())
+                st.markdown("#### Performance Statistics Comparison")
+                col_stats1, col_stats2 = st.columns(2)
+                
+                with col_stats1:
+                    st.markdown(f"**{driver1} (Fastest Lap)**")
+                    st.markdown(f"Max Speed: {max_speed1:.1f} km/h")
+                    st.markdown(f"Avg Speed: {avg_speed1:.1f} km/h")
+                    st.markdown(f"Min Speed: {min_speed1:.1f} km/h")
+                    st.markdown(f"Max RPM: {max_rpm1:.0f}")
+                
+                with col_stats2:
+                    st.markdown(f"**{driver2} (Second Fastest)**")
+                    st.markdown(f"Max Speed: {max_speed2:.1f} km/h")
+                    st.markdown(f"Avg Speed: {avg_speed2:.1f} km/h")
+                    st.markdown(f"Min Speed: {min_speed2:.1f} km/h")
+                    st.markdown(f"Max RPM: {max_rpm2:.0f}")
+                
+                # Delta analysis
+                st.markdown("#### Key Differences")
+                speed_delta = max_speed1 - max_speed2
+                avg_speed_delta = avg_speed1 - avg_speed2
+                
+                st.markdown(f"""
+                - **Top speed advantage:** {abs(speed_delta):.1f} km/h in favor of {driver1 if speed_delta > 0 else driver2}
+                - **Average speed advantage:** {abs(avg_speed_delta):.1f} km/h in favor of {driver1 if avg_speed_delta > 0 else driver2}
+                - **Total time difference:** {time_diff:.3f} seconds
+                """)
+                
+            else:
+                st.info("Not enough laps available for comparison. Need at least 2 valid laps in this session.")
+                
         except Exception as e:
-            st.error(f"Error loading data: {str(e)}")
-            st.info("Try a different race or session. Some combinations may not have data available.")
+            st.warning("Lap comparison data not available for this session")
+            st.caption("This feature requires at least 2 valid laps with telemetry data")
+        
+    except Exception as e:
+        st.error(f"Error displaying data: {str(e)}")
+        st.info("Try a different race or session. Some combinations may not have data available.")
 
-else:
+elif not analyze_button:
     st.info("Select a race and click 'Analyze' to get started")
     st.markdown("""
     ### About This Dashboard